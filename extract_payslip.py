@@ -6,53 +6,43 @@ Payslip Payment Details Extractor
 重构版本 - 采用更清晰的模块化结构
 """
 
+import io
+import math
+import os
 import re
 import pdfplumber
 import pandas as pd
+from pdfplumber.utils.text import LIGATURES
+from pdfminer.pdfdocument import PDFDocument
+from pdfminer.pdfparser import PDFParser
+from pdfminer.pdftypes import resolve1
 from pathlib import Path
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from functools import lru_cache
+from itertools import chain
 from datetime import datetime
-from typing import List, Dict, Optional, Tuple
-from dataclasses import dataclass
+from typing import ClassVar, Deque, Iterator, List, Dict, Optional, Sequence, Tuple, Type, TypeVar, Union, cast
+from dataclasses import dataclass, field
+
+try:
+    import pymupdf
+except ImportError:  # 可选依赖 (poetry install --extras fast)
+    pymupdf = None  # type: ignore[assignment]
 
 
 # ============================================================================
 # 数据模型 (Data Models)
 # ============================================================================
 
-@dataclass
+@dataclass(slots=True)
 class PayPeriodInfo:
     """工资周期信息"""
     period: Optional[str] = None
     paid_date: Optional[str] = None
 
 
-@dataclass
-class PaymentRecord:
-    """单条payment记录"""
-    pdf_file: str
-    page: int
-    pay_period: Optional[str]
-    paid_date: Optional[str]
-    work_date: str
-    hours: float
-    rate: float
-    amount: float
-
-    def to_dict(self) -> Dict:
-        """转换为字典格式"""
-        return {
-            'PDF File': self.pdf_file,
-            'Page': self.page,
-            'Pay Period': self.pay_period,
-            'Paid Date': self.paid_date,
-            'Work Date': self.work_date,
-            'Hours': self.hours,
-            'Rate': self.rate,
-            'Amount': self.amount
-        }
-
-
-@dataclass
+@dataclass(slots=True)
 class SummaryRecord:
     """汇总记录"""
     pdf_file: str
@@ -67,21 +57,133 @@ class SummaryRecord:
     ytd_nett_pay: Optional[float] = None
     disbursement_amount: Optional[float] = None
 
-    def to_dict(self) -> Dict:
-        """转换为字典格式"""
-        return {
-            'PDF File': self.pdf_file,
-            'Page': self.page,
-            'Pay Period': self.pay_period,
-            'Paid Date': self.paid_date,
-            'Gross Pay': self.gross_pay,
-            'Tax': self.tax,
-            'Nett Pay': self.nett_pay,
-            'YTD Gross Pay': self.ytd_gross_pay,
-            'YTD Tax': self.ytd_tax,
-            'YTD Nett Pay': self.ytd_nett_pay,
-            'Disbursement Amount': self.disbursement_amount
-        }
+
+BufferT = TypeVar('BufferT', bound='ColumnBuffer')
+
+
+class ColumnBuffer:
+    """按列存储的记录缓冲区基类 (每个字段一个列表, 直接构建DataFrame)"""
+
+    # 字段名 -> 输出列名, 由子类定义
+    COLUMNS: ClassVar[Dict[str, str]] = {}
+
+    def __len__(self) -> int:
+        """记录条数"""
+        return len(getattr(self, next(iter(self.COLUMNS))))
+
+    @classmethod
+    def concat(cls: Type[BufferT], buffers: Sequence[BufferT]) -> BufferT:
+        """
+        合并多个缓冲区, 每列只分配一次
+
+        Args:
+            buffers: 同类型的缓冲区列表
+
+        Returns:
+            合并后的缓冲区
+        """
+        return cls(**{
+            name: list(chain.from_iterable(getattr(buffer, name) for buffer in buffers))
+            for name in cls.COLUMNS
+        })
+
+    def as_dict(self) -> Dict[str, List]:
+        """转换为 {列名: 列数据} 字典格式"""
+        return {column: getattr(self, name) for name, column in self.COLUMNS.items()}
+
+
+@dataclass
+class PaymentBuffer(ColumnBuffer):
+    """
+    Payment记录缓冲区
+
+    reference/hours/rate/amount保存匹配到的原始字符串,
+    由DataExporter.to_dataframes按整列一次性转换
+    """
+    pdf_file: List[str] = field(default_factory=list)
+    page: List[int] = field(default_factory=list)
+    pay_period: List[Optional[str]] = field(default_factory=list)
+    paid_date: List[Optional[str]] = field(default_factory=list)
+    reference: List[str] = field(default_factory=list)
+    hours: List[str] = field(default_factory=list)
+    rate: List[str] = field(default_factory=list)
+    amount: List[str] = field(default_factory=list)
+
+    COLUMNS: ClassVar[Dict[str, str]] = {
+        'pdf_file': 'PDF File',
+        'page': 'Page',
+        'pay_period': 'Pay Period',
+        'paid_date': 'Paid Date',
+        'reference': 'Work Date',
+        'hours': 'Hours',
+        'rate': 'Rate',
+        'amount': 'Amount'
+    }
+
+    def append(self, pdf_file: str, page: int, pay_period: Optional[str],
+               paid_date: Optional[str], reference: str, hours: str,
+               rate: str, amount: str) -> None:
+        """追加单条payment记录"""
+        self.pdf_file.append(pdf_file)
+        self.page.append(page)
+        self.pay_period.append(pay_period)
+        self.paid_date.append(paid_date)
+        self.reference.append(reference)
+        self.hours.append(hours)
+        self.rate.append(rate)
+        self.amount.append(amount)
+
+
+@dataclass
+class SummaryBuffer(ColumnBuffer):
+    """Summary记录缓冲区"""
+    pdf_file: List[str] = field(default_factory=list)
+    page: List[int] = field(default_factory=list)
+    pay_period: List[Optional[str]] = field(default_factory=list)
+    paid_date: List[Optional[str]] = field(default_factory=list)
+    gross_pay: List[Optional[float]] = field(default_factory=list)
+    tax: List[Optional[float]] = field(default_factory=list)
+    nett_pay: List[Optional[float]] = field(default_factory=list)
+    ytd_gross_pay: List[Optional[float]] = field(default_factory=list)
+    ytd_tax: List[Optional[float]] = field(default_factory=list)
+    ytd_nett_pay: List[Optional[float]] = field(default_factory=list)
+    disbursement_amount: List[Optional[float]] = field(default_factory=list)
+
+    COLUMNS: ClassVar[Dict[str, str]] = {
+        'pdf_file': 'PDF File',
+        'page': 'Page',
+        'pay_period': 'Pay Period',
+        'paid_date': 'Paid Date',
+        'gross_pay': 'Gross Pay',
+        'tax': 'Tax',
+        'nett_pay': 'Nett Pay',
+        'ytd_gross_pay': 'YTD Gross Pay',
+        'ytd_tax': 'YTD Tax',
+        'ytd_nett_pay': 'YTD Nett Pay',
+        'disbursement_amount': 'Disbursement Amount'
+    }
+
+    def append(self, summary: SummaryRecord) -> None:
+        """
+        追加单页汇总记录
+
+        Args:
+            summary: SummaryRecord对象
+        """
+        for name in self.COLUMNS:
+            getattr(self, name).append(getattr(summary, name))
+
+
+@dataclass(slots=True)
+class PageContext:
+    """单页解析状态 (在单次扫描中由各解析器共享)"""
+    pdf_filename: str
+    page_num: int
+    pay_period_info: PayPeriodInfo
+    summary: SummaryRecord
+    payments: PaymentBuffer
+    in_payments_section: bool = False
+    payments_done: bool = False
 
 
 # ============================================================================
@@ -89,24 +191,78 @@ class SummaryRecord:
 # ============================================================================
 
 class PatternConfig:
-    """正则表达式模式配置"""
+    """正则表达式模式配置 (模块加载时预编译)"""
+
+    # 以下模式均作用于整页文本 (MULTILINE), 空白只匹配行内的空格/制表符
 
     # Pay Period和Paid Date模式
-    PAY_PERIOD_PATTERN = r'Pay Period (.+?) to (.+?) Paid (.+?)$'
+    PAY_PERIOD_RE = re.compile(
+        r'Pay Period (?P<period_start>.+?) to (?P<period_end>.+?) '
+        r'Paid (?P<paid_date>.+?)$',
+        re.MULTILINE
+    )
 
-    # Payment行模式
-    PAYMENT_PATTERN = r'CAS OrdPay \(incCASloading\)\s+([\d.]+)\s+([\d.]+)\s+(\w+)\s+([\d.]+)'
+    # Payments section起止模式 ("Hours"可能在同一行或下一行)
+    PAYMENTS_START_RE = re.compile(r'^[ \t]*Payments(?=.*Hours|.*\n.*Hours)', re.MULTILINE)
+    PAYMENTS_END_RE = re.compile(r'^[ \t]*(?:Deductions|Benefits)', re.MULTILINE)
 
-    # Summary模式
-    GROSS_PAY_PATTERN = r'Gross Pay\s+([\d.]+)\s+([\d.]+)'
-    TAX_PATTERN = r'^Tax\s+([\d.]+)\s+([\d.]+)'
-    NETT_PAY_PATTERN = r'Nett Pay\s+([\d.]+)\s+([\d.]+)'
-    DISBURSEMENT_PATTERN = r'Commonwealth Bank of Australia\s+\d+\s+([\d.]+)'
+    # Payment行模式
+    PAYMENT_RE = re.compile(
+        r'^CAS OrdPay \(incCASloading\)[ \t]+(?P<hours>[\d.]+)[ \t]+(?P<rate>[\d.]+)'
+        r'[ \t]+(?P<reference>\w+)[ \t]+(?P<amount>[\d.]+)',
+        re.MULTILINE
+    )
+
+    # Summary模式 (分组名与SummaryRecord字段一致)
+    GROSS_PAY_RE = re.compile(
+        r'^[ \t]*Gross Pay[ \t]+(?P<gross_pay>[\d.]+)[ \t]+(?P<ytd_gross_pay>[\d.]+)',
+        re.MULTILINE
+    )
+    TAX_RE = re.compile(
+        r'^[ \t]*Tax[ \t]+(?P<tax>[\d.]+)[ \t]+(?P<ytd_tax>[\d.]+)',
+        re.MULTILINE
+    )
+    NETT_PAY_RE = re.compile(
+        r'^[ \t]*Nett Pay[ \t]+(?P<nett_pay>[\d.]+)[ \t]+(?P<ytd_nett_pay>[\d.]+)',
+        re.MULTILINE
+    )
+    DISBURSEMENT_RE = re.compile(
+        r'Commonwealth Bank of Australia[ \t]+\d+[ \t]+(?P<disbursement_amount>[\d.]+)',
+        re.MULTILINE
+    )
+
+    # 合并的行首模式 - 单次finditer扫描整页, 通过match.lastgroup区分匹配类型。
+    # 行首锚点提到分支外, 非行首位置一次判断即被跳过; 不在行首的pay period
+    # 和disbursement先用子串判断, 再单独查找
+    PAGE_RE = re.compile(
+        '^(?:' + '|'.join(
+            f'(?P<{name}>{regex.pattern.removeprefix("^")})' for name, regex in (
+                ('payments_start', PAYMENTS_START_RE),
+                ('payments_end', PAYMENTS_END_RE),
+                ('payment', PAYMENT_RE),
+                ('gross_pay_line', GROSS_PAY_RE),
+                ('tax_line', TAX_RE),
+                ('nett_pay_line', NETT_PAY_RE),
+            )
+        ) + ')',
+        re.MULTILINE
+    )
+
+    # 页面文本规整: 行首尾空白 / 行内连续空白
+    LINE_EDGE_SPACE_RE = re.compile(r'^[^\S\n]+|[^\S\n]+$', re.MULTILINE)
+    INNER_SPACE_RE = re.compile(r'[^\S\n]+')
 
     # 日期格式
     REFERENCE_DATE_FORMAT = '%d%b%y'  # 例如: 01Jul24
     OUTPUT_DATE_FORMAT = '%Y-%m-%d'
 
+    # reference日期中的月份缩写 -> 月份数字
+    REFERENCE_MONTHS = {
+        'Jan': '01', 'Feb': '02', 'Mar': '03', 'Apr': '04',
+        'May': '05', 'Jun': '06', 'Jul': '07', 'Aug': '08',
+        'Sep': '09', 'Oct': '10', 'Nov': '11', 'Dec': '12'
+    }
+
 
 # ============================================================================
 # 工具类 (Utility Classes)
@@ -116,9 +272,10 @@ class DateParser:
     """日期解析器"""
 
     @staticmethod
+    @lru_cache(maxsize=1024)
     def parse_reference_date(ref_date: str) -> str:
         """
-        解析reference日期格式
+        解析reference日期格式 (结果缓存, 同一日期在工资单中会反复出现)
 
         Args:
             ref_date: 原始日期字符串 (如 01Jul24)
@@ -126,6 +283,14 @@ class DateParser:
         Returns:
             格式化后的日期字符串 (如 2024-07-01)
         """
+        # 快速路径: 标准的DDMonYY直接查表拼接。日期限定在01-28 (任何月份都合法),
+        # 年份限定在00-68 (%y解析为20xx), 其余情况交给strptime校验
+        day, month, year = ref_date[:2], ref_date[2:5], ref_date[5:]
+        month_number = PatternConfig.REFERENCE_MONTHS.get(month)
+        if (len(ref_date) == 7 and month_number and day.isdigit() and year.isdigit()
+                and '01' <= day <= '28' and year <= '68'):
+            return f'20{year}-{month_number}-{day}'
+
         try:
             date_obj = datetime.strptime(ref_date, PatternConfig.REFERENCE_DATE_FORMAT)
             return date_obj.strftime(PatternConfig.OUTPUT_DATE_FORMAT)
@@ -141,177 +306,442 @@ class PayPeriodParser:
     """工资周期解析器"""
 
     @staticmethod
-    def extract(lines: List[str]) -> PayPeriodInfo:
+    def parse(match: re.Match) -> PayPeriodInfo:
         """
-        从文本行中提取pay period信息
+        从匹配结果中解析pay period信息
 
         Args:
-            lines: 文本行列表
+            match: PatternConfig.PAY_PERIOD_RE的匹配结果
 
         Returns:
             PayPeriodInfo对象
         """
-        for line in lines:
-            if 'Pay Period' in line and 'Paid' in line:
-                match = re.search(PatternConfig.PAY_PERIOD_PATTERN, line)
-                if match:
-                    period = f"{match.group(1)} to {match.group(2)}"
-                    paid_date = match.group(3)
-                    return PayPeriodInfo(period=period, paid_date=paid_date)
-
-        return PayPeriodInfo()
+        period = f"{match['period_start']} to {match['period_end']}"
+        return PayPeriodInfo(period=period, paid_date=match['paid_date'])
 
 
 class PaymentParser:
     """Payment条目解析器"""
 
     @staticmethod
-    def extract(lines: List[str], pdf_filename: str, page_num: int,
-                pay_period_info: PayPeriodInfo) -> List[PaymentRecord]:
+    def start_section(match: re.Match, ctx: PageContext) -> None:
         """
-        从文本行中提取payment记录
+        处理Payments section标题行
 
         Args:
-            lines: 文本行列表
-            pdf_filename: PDF文件名
-            page_num: 页码
-            pay_period_info: 工资周期信息
+            match: PatternConfig.PAGE_RE中payments_start分支的匹配结果
+            ctx: 当前页解析状态
+        """
+        if not ctx.payments_done:
+            ctx.in_payments_section = True
 
-        Returns:
-            PaymentRecord列表
-        """
-        payments = []
-        in_payments_section = False
-
-        for i, line in enumerate(lines):
-            # 检测Payments section开始
-            if line.strip().startswith('Payments'):
-                # "Hours"可能在同一行或下一行
-                has_hours = ('Hours' in line or
-                           (i + 1 < len(lines) and 'Hours' in lines[i + 1]))
-                if has_hours:
-                    in_payments_section = True
-                    continue
-
-            # 检测Payments section结束
-            if in_payments_section:
-                if (line.strip().startswith('Deductions') or
-                    line.strip().startswith('Benefits')):
-                    break
-
-                # 尝试匹配payment行
-                match = re.match(PatternConfig.PAYMENT_PATTERN, line)
-                if match:
-                    hours = float(match.group(1))
-                    rate = float(match.group(2))
-                    reference_date = match.group(3)
-                    amount = float(match.group(4))
-
-                    payment = PaymentRecord(
-                        pdf_file=pdf_filename,
-                        page=page_num,
-                        pay_period=pay_period_info.period,
-                        paid_date=pay_period_info.paid_date,
-                        work_date=DateParser.parse_reference_date(reference_date),
-                        hours=hours,
-                        rate=rate,
-                        amount=amount
-                    )
-                    payments.append(payment)
-
-        return payments
+    @staticmethod
+    def end_section(match: re.Match, ctx: PageContext) -> None:
+        """
+        处理Payments section结束行 (Deductions/Benefits)
+
+        Args:
+            match: PatternConfig.PAGE_RE中payments_end分支的匹配结果
+            ctx: 当前页解析状态
+        """
+        if ctx.in_payments_section:
+            ctx.in_payments_section = False
+            ctx.payments_done = True
+
+    @staticmethod
+    def parse_into(match: re.Match, ctx: PageContext) -> None:
+        """
+        从匹配结果中解析payment记录并追加到缓冲区
+
+        Args:
+            match: PatternConfig.PAGE_RE中payment分支的匹配结果
+            ctx: 当前页解析状态
+        """
+        if not ctx.in_payments_section:
+            return
+
+        ctx.payments.append(
+            pdf_file=ctx.pdf_filename,
+            page=ctx.page_num,
+            pay_period=ctx.pay_period_info.period,
+            paid_date=ctx.pay_period_info.paid_date,
+            reference=match['reference'],
+            hours=match['hours'],
+            rate=match['rate'],
+            amount=match['amount']
+        )
 
 
 class SummaryParser:
     """Summary信息解析器"""
 
+    # PAGE_RE中各summary行分支对应的SummaryRecord字段
+    FIELDS = {
+        'gross_pay_line': ('gross_pay', 'ytd_gross_pay'),
+        'tax_line': ('tax', 'ytd_tax'),
+        'nett_pay_line': ('nett_pay', 'ytd_nett_pay'),
+    }
+    DISBURSEMENT_FIELDS = ('disbursement_amount',)
+
     @staticmethod
-    def extract(lines: List[str], pdf_filename: str, page_num: int,
-                pay_period_info: PayPeriodInfo) -> SummaryRecord:
+    def update(summary: SummaryRecord, match: re.Match,
+               fields: Sequence[str]) -> None:
         """
-        从文本行中提取summary信息
+        将summary行的匹配结果写入SummaryRecord
 
         Args:
-            lines: 文本行列表
+            summary: 当前页的SummaryRecord
+            match: summary模式的匹配结果
+            fields: 需要写入的字段 (与模式分组名一致)
+        """
+        for name in fields:
+            setattr(summary, name, float(match[name]))
+
+    @staticmethod
+    def parse_into(match: re.Match, ctx: PageContext) -> None:
+        """
+        处理PAGE_RE中的summary行
+
+        Args:
+            match: PatternConfig.PAGE_RE中summary分支的匹配结果
+            ctx: 当前页解析状态
+        """
+        SummaryParser.update(ctx.summary, match, SummaryParser.FIELDS[cast(str, match.lastgroup)])
+
+    @staticmethod
+    def is_complete(summary: SummaryRecord) -> bool:
+        """
+        判断PAGE_RE负责的summary字段是否已全部读取
+
+        Args:
+            summary: 当前页的SummaryRecord
+
+        Returns:
+            Gross Pay, Tax, Nett Pay均已读取时为True
+        """
+        return (summary.gross_pay is not None and summary.tax is not None
+                and summary.nett_pay is not None)
+
+
+class PageParser:
+    """单页解析器 - 单次扫描整页文本, 按匹配类型分派给各解析器"""
+
+    # PAGE_RE分支名 -> 处理函数
+    HANDLERS = {
+        'payments_start': PaymentParser.start_section,
+        'payments_end': PaymentParser.end_section,
+        'payment': PaymentParser.parse_into,
+        'gross_pay_line': SummaryParser.parse_into,
+        'tax_line': SummaryParser.parse_into,
+        'nett_pay_line': SummaryParser.parse_into,
+    }
+
+    @staticmethod
+    def parse(text: str, pdf_filename: str, page_num: int,
+              payments: PaymentBuffer) -> SummaryRecord:
+        """
+        解析单页文本, payment记录直接追加到缓冲区
+
+        Args:
+            text: 页面文本
             pdf_filename: PDF文件名
             page_num: 页码
-            pay_period_info: 工资周期信息
+            payments: Payment记录缓冲区
 
         Returns:
-            SummaryRecord对象
+            该页的SummaryRecord
         """
-        summary = SummaryRecord(
-            pdf_file=pdf_filename,
-            page=page_num,
-            pay_period=pay_period_info.period,
-            paid_date=pay_period_info.paid_date
+        pay_period_info = PayPeriodInfo()
+        if 'Pay Period' in text:
+            match = PatternConfig.PAY_PERIOD_RE.search(text)
+            if match:
+                pay_period_info = PayPeriodParser.parse(match)
+
+        ctx = PageContext(
+            pdf_filename=pdf_filename,
+            page_num=page_num,
+            pay_period_info=pay_period_info,
+            summary=SummaryRecord(
+                pdf_file=pdf_filename,
+                page=page_num,
+                pay_period=pay_period_info.period,
+                paid_date=pay_period_info.paid_date
+            ),
+            payments=payments
         )
 
-        for line in lines:
-            line_stripped = line.strip()
+        # PAGE_RE的每个分支都是命名分组, 匹配结果的lastgroup不会为None
+        for match in PatternConfig.PAGE_RE.finditer(text):
+            PageParser.HANDLERS[cast(str, match.lastgroup)](match, ctx)
 
-            # 提取Gross Pay
-            if line_stripped.startswith('Gross Pay'):
-                match = re.search(PatternConfig.GROSS_PAY_PATTERN, line)
-                if match:
-                    summary.gross_pay = float(match.group(1))
-                    summary.ytd_gross_pay = float(match.group(2))
+            # Payments section已结束且summary字段齐全, 页面剩余部分不会再有新信息
+            if ctx.payments_done and SummaryParser.is_complete(ctx.summary):
+                break
 
-            # 提取Tax
-            elif line_stripped.startswith('Tax') and not line.startswith('Tax'):
-                match = re.search(PatternConfig.TAX_PATTERN, line)
-                if match:
-                    summary.tax = float(match.group(1))
-                    summary.ytd_tax = float(match.group(2))
+        if 'Commonwealth Bank of Australia' in text:
+            for match in PatternConfig.DISBURSEMENT_RE.finditer(text):
+                SummaryParser.update(
+                    ctx.summary, match, SummaryParser.DISBURSEMENT_FIELDS
+                )
 
-            # 提取Nett Pay
-            elif line_stripped.startswith('Nett Pay'):
-                match = re.search(PatternConfig.NETT_PAY_PATTERN, line)
-                if match:
-                    summary.nett_pay = float(match.group(1))
-                    summary.ytd_nett_pay = float(match.group(2))
-
-            # 提取Disbursement
-            elif 'Commonwealth Bank of Australia' in line:
-                match = re.search(PatternConfig.DISBURSEMENT_PATTERN, line)
-                if match:
-                    summary.disbursement_amount = float(match.group(1))
-
-        return summary
+        return ctx.summary
 
 
 # ============================================================================
 # PDF处理器 (PDF Processor)
 # ============================================================================
 
+PDFSource = Union[str, io.BytesIO]
+
+
+class PdfplumberBackend:
+    """pdfplumber文本提取后端 (纯Python实现, 始终可用)"""
+
+    # 连字 -> 拆分字符 (如 "ﬁ" -> "fi"), 与extract_text(expand_ligatures=True)一致
+    LIGATURE_TABLE = str.maketrans(LIGATURES)
+
+    @staticmethod
+    def count_pages(pdf_path: str) -> int:
+        """
+        统计PDF文件页数
+
+        直接读取页面树根节点的/Count (与PyMuPDF相同);
+        len(pdf.pages)会为每一页构建Page对象, 关闭时还要逐页清理
+
+        Args:
+            pdf_path: PDF文件路径
+
+        Returns:
+            页数
+        """
+        with open(pdf_path, 'rb') as fp:
+            return resolve1(PDFDocument(PDFParser(fp)).catalog['Pages'])['Count']
+
+    @staticmethod
+    def extract_texts(source: PDFSource, page_numbers: Optional[Sequence[int]]
+                      ) -> Iterator[Tuple[int, str]]:
+        """
+        逐页提取文本
+
+        Args:
+            source: PDF文件路径或BytesIO
+            page_numbers: 需要处理的页码, 从1开始 (None表示全部页面)
+
+        Yields:
+            (页码, 页面文本)元组
+        """
+        with pdfplumber.open(source) as pdf:
+            if page_numbers is None:
+                page_numbers = range(1, len(pdf.pages) + 1)
+            for page_num in page_numbers:
+                page = pdf.pages[page_num - 1]
+                text = PdfplumberBackend._extract_page_text(page)
+                # 释放该页缓存的字符/版面对象, 内存不随页数增长
+                page.close()
+                yield page_num, text
+
+    @staticmethod
+    def _extract_page_text(page: pdfplumber.page.Page) -> str:
+        """
+        提取页面文本
+
+        使用不构建TextMap的extract_text_simple, 再把空白规整为单个空格
+        并展开连字, 使 "Beneﬁts" 等标题能被PAYMENTS_END_RE匹配
+
+        Args:
+            page: pdfplumber页面对象
+
+        Returns:
+            页面文本
+        """
+        text = page.extract_text_simple()
+        text = PatternConfig.LINE_EDGE_SPACE_RE.sub('', text)
+        text = PatternConfig.INNER_SPACE_RE.sub(' ', text)
+        return text.translate(PdfplumberBackend.LIGATURE_TABLE)
+
+
+class PyMuPDFBackend:
+    """PyMuPDF文本提取后端 (C实现, 比pdfplumber快一个数量级)"""
+
+    # 同一行内单词基线的容差, 与pdfplumber的y_tolerance默认值一致
+    Y_TOLERANCE = 3
+
+    @staticmethod
+    def _open(source: PDFSource) -> 'pymupdf.Document':
+        """打开PDF文件 (路径或BytesIO)"""
+        if isinstance(source, io.BytesIO):
+            return pymupdf.open(stream=source.getbuffer(), filetype='pdf')
+        return pymupdf.open(source)
+
+    @staticmethod
+    def count_pages(pdf_path: str) -> int:
+        """
+        统计PDF文件页数
+
+        Args:
+            pdf_path: PDF文件路径
+
+        Returns:
+            页数
+        """
+        with PyMuPDFBackend._open(pdf_path) as doc:
+            return doc.page_count
+
+    @staticmethod
+    def extract_texts(source: PDFSource, page_numbers: Optional[Sequence[int]]
+                      ) -> Iterator[Tuple[int, str]]:
+        """
+        逐页提取文本
+
+        Args:
+            source: PDF文件路径或BytesIO
+            page_numbers: 需要处理的页码, 从1开始 (None表示全部页面)
+
+        Yields:
+            (页码, 页面文本)元组
+        """
+        flags = pymupdf.TEXTFLAGS_WORDS & ~pymupdf.TEXT_PRESERVE_LIGATURES
+        with PyMuPDFBackend._open(source) as doc:
+            if page_numbers is None:
+                page_numbers = range(1, doc.page_count + 1)
+            for page_num in page_numbers:
+                # 与pdfplumber一样展开连字 (默认的TEXTFLAGS_WORDS保留 "ﬁ" 等连字)
+                textpage = doc.load_page(page_num - 1).get_textpage(flags=flags)
+                yield page_num, PyMuPDFBackend._textpage_to_text(textpage)
+
+    @staticmethod
+    def _textpage_to_text(textpage: 'pymupdf.TextPage') -> str:
+        """
+        按基线把单词拼成文本行
+
+        get_text('text')按文本块输出, 表格中的一行可能被拆成多行;
+        这里按基线聚类成行、行内按横坐标排序后用单个空格连接,
+        得到与pdfplumber相同的行结构。单词的顶部坐标随字号变化,
+        基线则不会, 且每个单词都与行首单词比较, 误差不会沿行累积
+
+        Args:
+            textpage: 页面的TextPage
+
+        Returns:
+            页面文本
+        """
+        # 单词所在文本行 (块号, 行号) -> 该行第一个span的基线纵坐标
+        baselines = {
+            (block['number'], line_no): line['spans'][0]['origin'][1]
+            for block in textpage.extractDICT()['blocks']
+            for line_no, line in enumerate(block['lines'])
+        }
+        words = sorted(
+            (baselines[block_no, line_no], x0, word)
+            for x0, _, _, _, word, block_no, line_no, _ in textpage.extractWORDS()
+        )
+
+        lines: List[List[Tuple[float, str]]] = []
+        line_baseline = 0.0
+        for baseline, x0, word in words:
+            if not lines or baseline > line_baseline + PyMuPDFBackend.Y_TOLERANCE:
+                lines.append([])
+                line_baseline = baseline
+            lines[-1].append((x0, word))
+
+        return '\n'.join(' '.join(word for _, word in sorted(line)) for line in lines)
+
+
+PDFBackend = Type[Union[PdfplumberBackend, PyMuPDFBackend]]
+
+
 class PDFProcessor:
     """PDF文件处理器"""
 
-    def __init__(self, pdf_path: str, pdf_filename: Optional[str] = None):
+    # 小于该大小的PDF整体读入内存后解析, 更大的文件直接按路径打开
+    MAX_IN_MEMORY_BYTES = 256 * 1024 * 1024
+
+    # 文本提取后端, 默认优先使用PyMuPDF (可选依赖), 未安装时使用pdfplumber
+    BACKENDS: ClassVar[Dict[str, PDFBackend]] = {
+        'pymupdf': PyMuPDFBackend,
+        'pdfplumber': PdfplumberBackend,
+    }
+    DEFAULT_BACKEND = 'pymupdf' if pymupdf is not None else 'pdfplumber'
+
+    def __init__(self, pdf_path: str, pdf_filename: Optional[str] = None,
+                 page_numbers: Optional[Sequence[int]] = None,
+                 backend: Optional[str] = None):
         """
         初始化PDF处理器
 
         Args:
             pdf_path: PDF文件路径
             pdf_filename: PDF文件名 (可选)
+            page_numbers: 需要处理的页码, 从1开始 (可选, 默认处理全部页面)
+            backend: 文本提取后端 'pymupdf' 或 'pdfplumber' (可选)
         """
         self.pdf_path = pdf_path
         self.pdf_filename = pdf_filename or Path(pdf_path).name
-        self.payments: List[PaymentRecord] = []
-        self.summaries: List[SummaryRecord] = []
+        self.page_numbers = page_numbers
+        self.backend = self._get_backend(backend)
+        # 只处理部分页面时该文件由多个进程共享, 按路径打开以共用系统文件缓存
+        self.pdf_source = self._load_source(pdf_path) if page_numbers is None else pdf_path
+        self.payments = PaymentBuffer()
+        self.summaries = SummaryBuffer()
+
+    @staticmethod
+    def _get_backend(backend: Optional[str]) -> PDFBackend:
+        """
+        获取文本提取后端
+
+        Args:
+            backend: 后端名称 (None表示默认后端)
+
+        Returns:
+            后端类
+        """
+        backend = backend or PDFProcessor.DEFAULT_BACKEND
+        if backend not in PDFProcessor.BACKENDS:
+            raise ValueError(f"未知的PDF后端: {backend}")
+        if backend == 'pymupdf' and pymupdf is None:
+            raise ValueError("PyMuPDF未安装, 请使用 poetry install --extras fast")
+        return PDFProcessor.BACKENDS[backend]
+
+    @staticmethod
+    def _load_source(pdf_path: str) -> PDFSource:
+        """
+        读取PDF数据源
 
-    def process(self) -> Tuple[List[PaymentRecord], List[SummaryRecord]]:
+        Args:
+            pdf_path: PDF文件路径
+
+        Returns:
+            内存中的BytesIO (文件较小时) 或原文件路径
+        """
+        path = Path(pdf_path)
+        if path.stat().st_size <= PDFProcessor.MAX_IN_MEMORY_BYTES:
+            return io.BytesIO(path.read_bytes())
+        return pdf_path
+
+    @staticmethod
+    def count_pages(pdf_path: str, backend: Optional[str] = None) -> int:
+        """
+        统计PDF文件页数 (按路径打开, 不把文件读入内存)
+
+        Args:
+            pdf_path: PDF文件路径
+            backend: 文本提取后端 (可选)
+
+        Returns:
+            页数
+        """
+        return PDFProcessor._get_backend(backend).count_pages(pdf_path)
+
+    def process(self) -> Tuple[PaymentBuffer, SummaryBuffer]:
         """
         处理PDF文件，提取所有数据
 
         Returns:
-            (payments列表, summaries列表)元组
+            (payments缓冲区, summaries缓冲区)元组
         """
-        with pdfplumber.open(self.pdf_path) as pdf:
-            for page_num, page in enumerate(pdf.pages, 1):
-                text = page.extract_text()
-                if text:
-                    self._process_page(text, page_num)
+        for page_num, text in self.backend.extract_texts(self.pdf_source, self.page_numbers):
+            if text:
+                self._process_page(text, page_num)
 
         return self.payments, self.summaries
 
@@ -323,21 +753,7 @@ class PDFProcessor:
             text: 页面文本
             page_num: 页码
         """
-        lines = text.split('\n')
-
-        # 提取pay period信息
-        pay_period_info = PayPeriodParser.extract(lines)
-
-        # 提取payments
-        payments = PaymentParser.extract(
-            lines, self.pdf_filename, page_num, pay_period_info
-        )
-        self.payments.extend(payments)
-
-        # 提取summary
-        summary = SummaryParser.extract(
-            lines, self.pdf_filename, page_num, pay_period_info
-        )
+        summary = PageParser.parse(text, self.pdf_filename, page_num, self.payments)
         self.summaries.append(summary)
 
 
@@ -349,23 +765,25 @@ class DataExporter:
     """数据导出器"""
 
     @staticmethod
-    def to_dataframes(payments: List[PaymentRecord],
-                     summaries: List[SummaryRecord]) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    def to_dataframes(payments: PaymentBuffer,
+                     summaries: SummaryBuffer) -> Tuple[pd.DataFrame, pd.DataFrame]:
         """
-        将记录列表转换为DataFrame
+        将记录缓冲区转换为DataFrame (按列直接构建)
 
         Args:
-            payments: Payment记录列表
-            summaries: Summary记录列表
+            payments: Payment记录缓冲区
+            summaries: Summary记录缓冲区
 
         Returns:
             (payments_df, summaries_df)元组
         """
-        payments_data = [p.to_dict() for p in payments]
-        summaries_data = [s.to_dict() for s in summaries]
+        payments_df = pd.DataFrame(payments.as_dict())
 
-        payments_df = pd.DataFrame(payments_data)
-        summaries_df = pd.DataFrame(summaries_data)
+        # 数值列和日期列按整列转换; 日期解析带缓存, 重复日期只解析一次
+        payments_df = payments_df.astype({'Hours': float, 'Rate': float, 'Amount': float})
+        payments_df['Work Date'] = payments_df['Work Date'].map(DateParser.parse_reference_date)
+
+        summaries_df = pd.DataFrame(summaries.as_dict())
 
         return payments_df, summaries_df
 
@@ -380,7 +798,8 @@ class DataExporter:
             summaries_df: Summaries DataFrame
             output_file: 输出文件名
         """
-        with pd.ExcelWriter(output_file, engine='openpyxl') as writer:
+        # xlsxwriter只负责写入, 比openpyxl更快且占用内存更少
+        with pd.ExcelWriter(output_file, engine='xlsxwriter') as writer:
             payments_df.to_excel(writer, sheet_name='Payment Details', index=False)
             summaries_df.to_excel(writer, sheet_name='Summary', index=False)
 
@@ -393,11 +812,15 @@ class DataExporter:
             payments_df: Payments DataFrame
             summaries_df: Summaries DataFrame
         """
+        # Summary的三列一次求和
+        totals = summaries_df[['Gross Pay', 'Tax', 'Nett Pay']].sum()
+        total_hours = payments_df['Hours'].sum()
+
         print("\n=== 统计信息 ===")
-        print(f"总工作小时数: {payments_df['Hours'].sum():.2f}")
-        print(f"总收入 (Gross): ${summaries_df['Gross Pay'].sum():,.2f}")
-        print(f"总税额: ${summaries_df['Tax'].sum():,.2f}")
-        print(f"总净收入 (Nett): ${summaries_df['Nett Pay'].sum():,.2f}")
+        print(f"总工作小时数: {total_hours:.2f}")
+        print(f"总收入 (Gross): ${totals['Gross Pay']:,.2f}")
+        print(f"总税额: ${totals['Tax']:,.2f}")
+        print(f"总净收入 (Nett): ${totals['Nett Pay']:,.2f}")
 
     @staticmethod
     def print_sample_data(payments_df: pd.DataFrame, n: int = 10) -> None:
@@ -416,28 +839,62 @@ class DataExporter:
 # 主处理器 (Main Processor)
 # ============================================================================
 
+def _process_pdf(pdf_file: Path, page_numbers: Optional[Sequence[int]],
+                 backend: Optional[str] = None) -> Tuple[PaymentBuffer, SummaryBuffer]:
+    """
+    进程池工作函数 - 处理整个PDF文件或其中的一段页面
+
+    Args:
+        pdf_file: PDF文件路径
+        page_numbers: 需要处理的页码 (None表示全部页面)
+        backend: 文本提取后端 (可选)
+
+    Returns:
+        (payments缓冲区, summaries缓冲区)元组
+    """
+    return PDFProcessor(str(pdf_file), pdf_file.name, page_numbers, backend).process()
+
+
+# 进程池任务: (PDF文件路径, 任务Future, 是否为该文件最后一个任务)
+PageTask = Tuple[Path, Future, bool]
+
+
 class PayslipProcessor:
     """工资单处理器主类"""
 
-    def __init__(self, pdf_directory: Path = Path('.')):
+    # 小于该大小的PDF整个作为一个任务 (文件之间已经并行), 不统计页数也不拆分
+    MIN_SPLIT_BYTES = 1024 * 1024
+
+    # 大文件按页段拆分到各进程, 每段至少这么多页:
+    # 每个任务都要重新打开整个文件, 页段太小时打开开销会超过解析本身
+    MIN_PAGES_PER_TASK = 64
+
+    def __init__(self, pdf_directory: Path = Path('.'),
+                 max_workers: Optional[int] = None,
+                 backend: Optional[str] = None):
         """
         初始化工资单处理器
 
         Args:
             pdf_directory: PDF文件所在目录
+            max_workers: 并行处理的进程数 (默认为CPU核数)
+            backend: 文本提取后端 'pymupdf' 或 'pdfplumber' (可选)
         """
         self.pdf_directory = pdf_directory
-        self.all_payments: List[PaymentRecord] = []
-        self.all_summaries: List[SummaryRecord] = []
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.backend = backend
+        # 各任务返回的缓冲区, 全部处理完后一次性合并
+        self.all_payments: List[PaymentBuffer] = []
+        self.all_summaries: List[SummaryBuffer] = []
 
-    def find_pdf_files(self) -> List[Path]:
+    def find_pdf_files(self) -> Iterator[Path]:
         """
         查找目录下的所有PDF文件
 
         Returns:
-            PDF文件路径列表
+            PDF文件路径迭代器 (逐个产生, 不预先构建列表)
         """
-        return list(self.pdf_directory.glob('data/*.pdf'))
+        return self.pdf_directory.glob('data/*.pdf')
 
     def process_all_pdfs(self) -> Tuple[pd.DataFrame, pd.DataFrame]:
         """
@@ -446,42 +903,101 @@ class PayslipProcessor:
         Returns:
             (payments_df, summaries_df)元组
         """
-        pdf_files = self.find_pdf_files()
-
-        if not pdf_files:
+        # 边查找边提交任务: 主进程统计下一个文件页数的同时, 进程池处理已提交的页段。
+        # 未完成任务数量有上限, 结果按提交顺序 (文件和页码顺序) 收集
+        pending: Deque[PageTask] = deque()
+        max_pending = self.max_workers * 2
+        file_counts: Dict[Path, List[int]] = {}
+
+        with ProcessPoolExecutor(max_workers=self.max_workers) as executor:
+            for pdf_file in self.find_pdf_files():
+                file_counts[pdf_file] = [0, 0]
+                for task in self._submit_pdf(executor, pdf_file):
+                    pending.append(task)
+                    if len(pending) > max_pending:
+                        self._collect(pending.popleft(), file_counts)
+
+            while pending:
+                self._collect(pending.popleft(), file_counts)
+
+        if not file_counts:
             print("未找到PDF文件！")
             return pd.DataFrame(), pd.DataFrame()
 
-        print(f"找到 {len(pdf_files)} 个PDF文件\n")
-
-        # 处理每个PDF文件
-        for pdf_file in pdf_files:
-            self._process_single_pdf(pdf_file)
+        print(f"共处理 {len(file_counts)} 个PDF文件\n")
 
-        # 转换为DataFrame
-        if self.all_payments:
-            return DataExporter.to_dataframes(self.all_payments, self.all_summaries)
+        # 合并所有缓冲区, 一次性转换为DataFrame
+        if any(self.all_payments):
+            return DataExporter.to_dataframes(
+                PaymentBuffer.concat(self.all_payments),
+                SummaryBuffer.concat(self.all_summaries)
+            )
         else:
             print("未提取到任何数据！")
             return pd.DataFrame(), pd.DataFrame()
 
-    def _process_single_pdf(self, pdf_file: Path) -> None:
+    def _submit_pdf(self, executor: ProcessPoolExecutor,
+                    pdf_file: Path) -> Iterator[PageTask]:
         """
-        处理单个PDF文件
+        按页段拆分单个PDF文件并逐个提交到进程池
 
         Args:
+            executor: 进程池
             pdf_file: PDF文件路径
+
+        Yields:
+            (PDF文件路径, 任务Future, 是否为该文件最后一个任务)元组
         """
-        print(f"正在处理: {pdf_file.name}")
+        if self.max_workers > 1 and pdf_file.stat().st_size >= self.MIN_SPLIT_BYTES:
+            page_count = PDFProcessor.count_pages(str(pdf_file), self.backend)
+            # 页段数不超过进程数, 每个进程最多打开该文件一次
+            pages_per_task = max(self.MIN_PAGES_PER_TASK,
+                                 math.ceil(page_count / self.max_workers))
+        else:
+            page_count = pages_per_task = 0
+
+        if page_count <= pages_per_task:
+            yield pdf_file, executor.submit(_process_pdf, pdf_file, None, self.backend), True
+            return
 
-        processor = PDFProcessor(str(pdf_file), pdf_file.name)
-        payments, summaries = processor.process()
+        for start in range(1, page_count + 1, pages_per_task):
+            stop = min(start + pages_per_task, page_count + 1)
+            future = executor.submit(_process_pdf, pdf_file, range(start, stop), self.backend)
+            yield pdf_file, future, stop > page_count
+
+    def _collect(self, task: PageTask, file_counts: Dict[Path, List[int]]) -> None:
+        """
+        收集单个任务的结果, 文件的最后一个任务完成时打印该文件的处理结果
+
+        Args:
+            task: (PDF文件路径, 任务Future, 是否为该文件最后一个任务)元组
+            file_counts: 各文件已提取的 [payment记录数, summary记录数]
+        """
+        pdf_file, future, is_last = task
+        counts = file_counts[pdf_file]
+        payments, summaries = future.result()
+        self.all_payments.append(payments)
+        self.all_summaries.append(summaries)
+        counts[0] += len(payments)
+        counts[1] += len(summaries)
 
-        self.all_payments.extend(payments)
-        self.all_summaries.extend(summaries)
+        if is_last:
+            self._print_file_result(pdf_file, *counts)
 
-        print(f"  - 提取了 {len(payments)} 条payment记录")
-        print(f"  - 提取了 {len(summaries)} 个pay period汇总\n")
+    @staticmethod
+    def _print_file_result(pdf_file: Path, payment_count: int,
+                           summary_count: int) -> None:
+        """
+        打印单个PDF文件的处理结果
+
+        Args:
+            pdf_file: PDF文件路径
+            payment_count: 该文件的Payment记录数
+            summary_count: 该文件的Summary记录数
+        """
+        print(f"已处理: {pdf_file.name}")
+        print(f"  - 提取了 {payment_count} 条payment记录")
+        print(f"  - 提取了 {summary_count} 个pay period汇总\n")
 
 
 # ============================================================================
@@ -0,0 +1,138 @@
+"""extract_payslip 回归测试"""
+
+import pytest
+
+from extract_payslip import (
+    DateParser, PageParser, PaymentBuffer, PDFProcessor, PdfplumberBackend,
+    PyMuPDFBackend, pymupdf
+)
+
+
+requires_pymupdf = pytest.mark.skipif(pymupdf is None, reason='PyMuPDF未安装')
+
+
+def parse_page(text: str):
+    """解析单页文本, 返回该页的SummaryRecord"""
+    return PageParser.parse(text, 'test.pdf', 1, PaymentBuffer())
+
+
+def write_pdf(path, rows) -> str:
+    """
+    用PyMuPDF生成单页测试PDF, 每个单元格单独写入
+
+    Args:
+        path: 输出文件路径
+        rows: 行列表, 每行为 [(文本, 字号, 基线偏移), ...]
+
+    Returns:
+        PDF文件路径
+    """
+    doc = pymupdf.open()
+    page = doc.new_page()
+    writer = pymupdf.TextWriter(page.rect)
+    font = pymupdf.Font('helv')
+    for row_num, cells in enumerate(rows):
+        x = 40.0
+        for text, size, offset in cells:
+            writer.append((x, 60 + 18 * row_num + offset), text, font=font, fontsize=size)
+            x += font.text_length(text, fontsize=size) + 8
+    writer.write_text(page)
+    doc.save(str(path))
+    return str(path)
+
+
+# ============================================================================
+# Summary行 (Summary Lines)
+# ============================================================================
+
+@pytest.mark.parametrize('line', [
+    'Tax 9.02 27.06',
+    '   Tax 9.02 27.06',
+])
+def test_tax_line(line):
+    """Tax行无论是否缩进都能提取本期和YTD税额"""
+    summary = parse_page(f'Gross Pay 90.24 270.72\n{line}\nNett Pay 81.22 243.66')
+    assert summary.tax == 9.02
+    assert summary.ytd_tax == 27.06
+
+
+def test_taxable_line_is_not_tax():
+    """以Tax开头的其他行 (如Taxable) 不会被当作Tax行"""
+    summary = parse_page('Gross Pay 90.24 270.72\nTaxable 90.24 270.72\nNett Pay 81.22 243.66')
+    assert summary.tax is None
+    assert summary.ytd_tax is None
+
+
+# ============================================================================
+# 日期解析 (Date Parsing)
+# ============================================================================
+
+@pytest.mark.parametrize('ref_date, expected', [
+    ('03Jul24', '2024-07-03'),
+    ('28Feb23', '2023-02-28'),
+    ('29Feb24', '2024-02-29'),   # 闰年, 日期超过28由strptime校验
+    ('29Feb23', '29Feb23'),      # 非闰年, 保留原始字符串
+    ('31Apr24', '31Apr24'),      # 不存在的日期, 保留原始字符串
+    ('01Jul68', '2068-07-01'),
+    ('01Jul69', '1969-07-01'),   # %y: 69-99解析为19xx
+    ('01jul24', '2024-07-01'),   # 月份大小写不敏感
+    ('1Jul24', '2024-07-01'),
+    ('Ref123', 'Ref123'),
+])
+def test_parse_reference_date(ref_date, expected):
+    """快速路径与strptime回退的结果一致"""
+    assert DateParser.parse_reference_date(ref_date) == expected
+
+
+# ============================================================================
+# PDF后端 (PDF Backends)
+# ============================================================================
+
+@requires_pymupdf
+def test_backends_extract_same_text(tmp_path):
+    """两个后端得到相同的页面文本, 连字 ("Beneﬁts") 均被展开"""
+    rows = [[(cell, 10, 0) for cell in row] for row in [
+        ['Pay Period 01 Jul 2024 to 14 Jul 2024 Paid 20 Jul 2024'],
+        ['Payments', 'Hours', 'Rate', 'Reference', 'Amount'],
+        ['CAS OrdPay (incCASloading)', '2.00', '45.12', '03Jul24', '90.24'],
+        ['Beneﬁts'],
+        ['CAS OrdPay (incCASloading)', '1.00', '1.00', '01Jan24', '1.00'],
+        ['Gross Pay', '90.24', '270.72'],
+        ['Tax', '9.02', '27.06'],
+        ['Nett Pay', '81.22', '243.66'],
+    ]]
+    pdf_path = write_pdf(tmp_path / 'payslip.pdf', rows)
+
+    texts = list(PyMuPDFBackend.extract_texts(pdf_path, None))
+    assert texts == list(PdfplumberBackend.extract_texts(pdf_path, None))
+    assert 'Benefits' in texts[0][1]
+
+    payments, _ = PDFProcessor(pdf_path, backend='pymupdf').process()
+    assert payments.amount == ['90.24']
+
+
+@requires_pymupdf
+def test_pymupdf_groups_mixed_font_sizes_by_baseline(tmp_path):
+    """同一行的单元格字号不同且基线有小幅偏移时仍拼成一行"""
+    offsets = iter([-1.5, 0, 1.5, 0.75, -0.75] * 10)
+
+    def row(*cells):
+        return [(text, size, next(offsets)) for text, size in cells]
+
+    rows = [
+        row(('Pay Period 01 Jul 2024 to 14 Jul 2024 Paid 20 Jul 2024', 9)),
+        row(('Payments', 11), ('Hours', 8), ('Rate', 8), ('Reference', 8), ('Amount', 8)),
+        *[row(('CAS OrdPay (incCASloading)', 8), ('2.00', 11), ('45.12', 11),
+              ('03Jul24', 9), ('90.24', 12)) for _ in range(5)],
+        row(('Deductions', 11)),
+        row(('Gross Pay', 8), ('451.20', 12), ('1353.60', 12)),
+        row(('Tax', 8), ('45.12', 12), ('135.36', 12)),
+        row(('Nett Pay', 8), ('406.08', 12), ('1218.24', 12)),
+    ]
+    pdf_path = write_pdf(tmp_path / 'payslip.pdf', rows)
+
+    payments, summaries = PDFProcessor(pdf_path, backend='pymupdf').process()
+    assert payments.amount == ['90.24'] * 5
+    assert summaries.gross_pay == [451.20]
+    assert summaries.tax == [45.12]
+    assert summaries.nett_pay == [406.08]